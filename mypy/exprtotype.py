@@ -1,6 +1,7 @@
 """Translate an Expression to a Type value."""
 
-from typing import Optional
+from typing import List, Optional
+from typing_extensions import Final
 
 from mypy.nodes import (
     Expression, NameExpr, MemberExpr, IndexExpr, RefExpr, TupleExpr, IntExpr, FloatExpr, UnaryExpr,
@@ -14,6 +15,11 @@ from mypy.types import (
 )
 from mypy.options import Options
 
+ANNOTATED_TYPE_NAMES: Final = {'typing.Annotated', 'typing_extensions.Annotated'}
+
+# The first Python version supporting X | Y union syntax (PEP 604).
+UNION_SYNTAX_VERSION: Final = (3, 10)
+
 
 class TypeTranslationError(Exception):
     """Exception raised when an expression is not valid as a type."""
@@ -40,124 +46,187 @@ def expr_to_unanalyzed_type(expr: Expression,
     """
     # The `parent` parameter is used in recursive calls to provide context for
     # understanding whether an CallableArgument is ok.
-    name: Optional[str] = None
-    if isinstance(expr, NameExpr):
-        name = expr.name
-        if name == 'True':
-            return RawExpressionType(True, 'builtins.bool', line=expr.line, column=expr.column)
-        elif name == 'False':
-            return RawExpressionType(False, 'builtins.bool', line=expr.line, column=expr.column)
-        else:
-            return UnboundType(name, line=expr.line, column=expr.column)
-    elif isinstance(expr, MemberExpr):
-        fullname = get_member_expr_fullname(expr)
-        if fullname:
-            return UnboundType(fullname, line=expr.line, column=expr.column)
-        else:
-            raise TypeTranslationError()
-    elif isinstance(expr, IndexExpr):
-        base = expr_to_unanalyzed_type(expr.base, options, expr)
-        if isinstance(base, UnboundType):
-            if base.args:
-                raise TypeTranslationError()
-            if isinstance(expr.index, TupleExpr):
-                args = expr.index.items
-            else:
-                args = [expr.index]
-
-            if isinstance(expr.base, RefExpr) and expr.base.fullname in [
-                'typing.Annotated', 'typing_extensions.Annotated'
-            ]:
-                # TODO: this is not the optimal solution as we are basically getting rid
-                # of the Annotation definition and only returning the type information,
-                # losing all the annotations.
-
-                return expr_to_unanalyzed_type(args[0], options, expr)
-            else:
-                base.args = tuple(expr_to_unanalyzed_type(arg, options, expr) for arg in args)
-            if not base.args:
-                base.empty_tuple_index = True
-            return base
-        else:
-            raise TypeTranslationError()
-    elif (isinstance(expr, OpExpr)
-          and expr.op == '|'
-          and options
-          and options.python_version >= (3, 10)):
-        return UnionType([expr_to_unanalyzed_type(expr.left, options),
-                          expr_to_unanalyzed_type(expr.right, options)])
-    elif isinstance(expr, CallExpr) and isinstance(_parent, ListExpr):
-        c = expr.callee
-        names = []
-        # Go through the dotted member expr chain to get the full arg
-        # constructor name to look up
-        while True:
-            if isinstance(c, NameExpr):
-                names.append(c.name)
-                break
-            elif isinstance(c, MemberExpr):
-                names.append(c.name)
-                c = c.expr
-            else:
-                raise TypeTranslationError()
-        arg_const = '.'.join(reversed(names))
-
-        # Go through the constructor args to get its name and type.
-        name = None
-        default_type = AnyType(TypeOfAny.unannotated)
-        typ: Type = default_type
-        for i, arg in enumerate(expr.args):
-            if expr.arg_names[i] is not None:
-                if expr.arg_names[i] == "name":
-                    if name is not None:
-                        # Two names
-                        raise TypeTranslationError()
-                    name = _extract_argument_name(arg)
-                    continue
-                elif expr.arg_names[i] == "type":
-                    if typ is not default_type:
-                        # Two types
-                        raise TypeTranslationError()
-                    typ = expr_to_unanalyzed_type(arg, options, expr)
-                    continue
-                else:
-                    raise TypeTranslationError()
-            elif i == 0:
-                typ = expr_to_unanalyzed_type(arg, options, expr)
-            elif i == 1:
-                name = _extract_argument_name(arg)
-            else:
-                raise TypeTranslationError()
-        return CallableArgument(typ, name, arg_const, expr.line, expr.column)
-    elif isinstance(expr, ListExpr):
+    #
+    # All the supported expression node classes are leaf classes, so we can
+    # compare the exact type, which is cheaper than isinstance. The most common
+    # kinds of expressions in types are checked first.
+    if type(expr) is NameExpr:
+        return _name_expr_to_type(expr)
+    elif type(expr) is IndexExpr:
+        return _index_expr_to_type(expr, options)
+    elif type(expr) is MemberExpr:
+        return _member_expr_to_type(expr)
+    elif type(expr) is StrExpr:
+        return _str_expr_to_type(expr)
+    elif type(expr) is OpExpr:
+        return _op_expr_to_type(expr, options)
+    elif type(expr) is ListExpr:
         return TypeList([expr_to_unanalyzed_type(t, options, expr) for t in expr.items],
                         line=expr.line, column=expr.column)
-    elif isinstance(expr, StrExpr):
-        return parse_type_string(expr.value, 'builtins.str', expr.line, expr.column,
-                                 assume_str_is_unicode=expr.from_python_3)
-    elif isinstance(expr, BytesExpr):
-        return parse_type_string(expr.value, 'builtins.bytes', expr.line, expr.column,
-                                 assume_str_is_unicode=False)
-    elif isinstance(expr, UnicodeExpr):
-        return parse_type_string(expr.value, 'builtins.unicode', expr.line, expr.column,
-                                 assume_str_is_unicode=True)
-    elif isinstance(expr, UnaryExpr):
-        typ = expr_to_unanalyzed_type(expr.expr, options)
-        if isinstance(typ, RawExpressionType):
-            if isinstance(typ.literal_value, int) and expr.op == '-':
-                typ.literal_value *= -1
-                return typ
-        raise TypeTranslationError()
-    elif isinstance(expr, IntExpr):
+    elif type(expr) is CallExpr:
+        return _call_expr_to_type(expr, options, _parent)
+    elif type(expr) is EllipsisExpr:
+        return EllipsisType(expr.line)
+    elif type(expr) is IntExpr:
         return RawExpressionType(expr.value, 'builtins.int', line=expr.line, column=expr.column)
-    elif isinstance(expr, FloatExpr):
+    elif type(expr) is UnaryExpr:
+        return _unary_expr_to_type(expr, options)
+    elif type(expr) is FloatExpr:
         # Floats are not valid parameters for RawExpressionType , so we just
         # pass in 'None' for now. We'll report the appropriate error at a later stage.
         return RawExpressionType(None, 'builtins.float', line=expr.line, column=expr.column)
-    elif isinstance(expr, ComplexExpr):
+    elif type(expr) is ComplexExpr:
         # Same thing as above with complex numbers.
         return RawExpressionType(None, 'builtins.complex', line=expr.line, column=expr.column)
-    elif isinstance(expr, EllipsisExpr):
-        return EllipsisType(expr.line)
+    elif type(expr) is BytesExpr:
+        return _bytes_expr_to_type(expr)
+    elif type(expr) is UnicodeExpr:
+        return _unicode_expr_to_type(expr)
     else:
         raise TypeTranslationError()
+
+
+def _name_expr_to_type(expr: NameExpr) -> ProperType:
+    name = expr.name
+    if name == 'True':
+        return RawExpressionType(True, 'builtins.bool', line=expr.line, column=expr.column)
+    elif name == 'False':
+        return RawExpressionType(False, 'builtins.bool', line=expr.line, column=expr.column)
+    else:
+        return UnboundType(name, line=expr.line, column=expr.column)
+
+
+def _member_expr_to_type(expr: MemberExpr) -> ProperType:
+    fullname = get_member_expr_fullname(expr)
+    if fullname:
+        return UnboundType(fullname, line=expr.line, column=expr.column)
+    else:
+        raise TypeTranslationError()
+
+
+def _index_expr_to_type(expr: IndexExpr, options: Optional[Options]) -> ProperType:
+    base_expr = expr.base
+    base = expr_to_unanalyzed_type(base_expr, options, expr)
+    if isinstance(base, UnboundType):
+        if base.args:
+            raise TypeTranslationError()
+        index = expr.index
+        if isinstance(index, TupleExpr):
+            args = index.items
+        else:
+            args = [index]
+
+        if isinstance(base_expr, RefExpr) and base_expr.fullname in ANNOTATED_TYPE_NAMES:
+            # TODO: this is not the optimal solution as we are basically getting rid
+            # of the Annotation definition and only returning the type information,
+            # losing all the annotations.
+
+            return expr_to_unanalyzed_type(args[0], options, expr)
+
+        # Special case the common one and two argument forms (e.g. List[int] and
+        # Dict[str, int]) to avoid the generator overhead.
+        n = len(args)
+        if n == 1:
+            base.args = (expr_to_unanalyzed_type(args[0], options, expr),)
+        elif n == 2:
+            base.args = (expr_to_unanalyzed_type(args[0], options, expr),
+                         expr_to_unanalyzed_type(args[1], options, expr))
+        else:
+            base.args = tuple(expr_to_unanalyzed_type(arg, options, expr) for arg in args)
+            if n == 0:
+                base.empty_tuple_index = True
+        return base
+    else:
+        raise TypeTranslationError()
+
+
+def _op_expr_to_type(expr: OpExpr, options: Optional[Options]) -> ProperType:
+    if not (expr.op == '|' and options and options.python_version >= UNION_SYNTAX_VERSION):
+        raise TypeTranslationError()
+    # X | Y | Z is parsed as (X | Y) | Z, so walk down the chain of left operands
+    # with an explicit stack instead of recursing once per union item.
+    rights: List[Expression] = []
+    left: Expression = expr
+    while isinstance(left, OpExpr) and left.op == '|':
+        rights.append(left.right)
+        left = left.left
+    typ = expr_to_unanalyzed_type(left, options)
+    while rights:
+        typ = UnionType([typ, expr_to_unanalyzed_type(rights.pop(), options)])
+    return typ
+
+
+def _call_expr_to_type(expr: CallExpr,
+                       options: Optional[Options],
+                       _parent: Optional[Expression]) -> ProperType:
+    if not isinstance(_parent, ListExpr):
+        raise TypeTranslationError()
+    c = expr.callee
+    # Get the full arg constructor name to look up
+    arg_const: Optional[str] = None
+    if isinstance(c, NameExpr):
+        arg_const = c.name
+    elif isinstance(c, MemberExpr):
+        arg_const = get_member_expr_fullname(c)
+    if arg_const is None:
+        raise TypeTranslationError()
+
+    # Go through the constructor args to get its name and type.
+    name = None
+    default_type = AnyType(TypeOfAny.unannotated)
+    typ: Type = default_type
+    arg_names = expr.arg_names
+    for i, arg in enumerate(expr.args):
+        arg_name = arg_names[i]
+        if arg_name is not None:
+            if arg_name == "name":
+                if name is not None:
+                    # Two names
+                    raise TypeTranslationError()
+                name = _extract_argument_name(arg)
+                continue
+            elif arg_name == "type":
+                if typ is not default_type:
+                    # Two types
+                    raise TypeTranslationError()
+                typ = expr_to_unanalyzed_type(arg, options, expr)
+                continue
+            else:
+                raise TypeTranslationError()
+        elif i == 0:
+            typ = expr_to_unanalyzed_type(arg, options, expr)
+        elif i == 1:
+            name = _extract_argument_name(arg)
+        else:
+            raise TypeTranslationError()
+    return CallableArgument(typ, name, arg_const, expr.line, expr.column)
+
+
+def _str_expr_to_type(expr: StrExpr) -> ProperType:
+    return parse_type_string(expr.value, 'builtins.str', expr.line, expr.column,
+                             assume_str_is_unicode=expr.from_python_3)
+
+
+def _bytes_expr_to_type(expr: BytesExpr) -> ProperType:
+    return parse_type_string(expr.value, 'builtins.bytes', expr.line, expr.column,
+                             assume_str_is_unicode=False)
+
+
+def _unicode_expr_to_type(expr: UnicodeExpr) -> ProperType:
+    return parse_type_string(expr.value, 'builtins.unicode', expr.line, expr.column,
+                             assume_str_is_unicode=True)
+
+
+def _unary_expr_to_type(expr: UnaryExpr, options: Optional[Options]) -> ProperType:
+    operand = expr.expr
+    if isinstance(operand, IntExpr) and expr.op == '-':
+        # Negative integer literals are by far the most common case, so construct
+        # the negated type directly.
+        return RawExpressionType(-operand.value, 'builtins.int',
+                                 line=operand.line, column=operand.column)
+    typ = expr_to_unanalyzed_type(operand, options)
+    if isinstance(typ, RawExpressionType):
+        if isinstance(typ.literal_value, int) and expr.op == '-':
+            typ.literal_value *= -1
+            return typ
+    raise TypeTranslationError()
@@ -3091,14 +3091,20 @@ def get_member_expr_fullname(expr: MemberExpr) -> Optional[str]:
     Return a string of form foo.bar, foo.bar.baz, or similar, or None if the
     argument cannot be represented in this form.
     """
-    initial: Optional[str] = None
-    if isinstance(expr.expr, NameExpr):
-        initial = expr.expr.name
-    elif isinstance(expr.expr, MemberExpr):
-        initial = get_member_expr_fullname(expr.expr)
-    else:
+    base = expr.expr
+    if isinstance(base, NameExpr):
+        # Fast path for the common single attribute case, such as foo.Bar.
+        return base.name + '.' + expr.name
+    # Walk down the attribute chain collecting names innermost last, and
+    # join them in reverse once the NameExpr at the start of the chain is found.
+    names = [expr.name]
+    while isinstance(base, MemberExpr):
+        names.append(base.name)
+        base = base.expr
+    if not isinstance(base, NameExpr):
         return None
-    return '{}.{}'.format(initial, expr.name)
+    names.append(base.name)
+    return '.'.join(reversed(names))
 
 
 deserialize_map: Final = {
@@ -1,6 +1,8 @@
 """Tests for the mypy parser."""
 
 import sys
+from typing import Tuple
+from unittest import TestCase
 
 from pytest import skip
 
@@ -9,7 +11,9 @@ from mypy.test.helpers import assert_string_arrays_equal, parse_options
 from mypy.test.data import DataDrivenTestCase, DataSuite
 from mypy.parse import parse
 from mypy.errors import CompileError
+from mypy.fastparse import parse_type_comment, parse_type_string
 from mypy.options import Options
+from mypy.types import ProperType, RawExpressionType, UnboundType, UnionType
 
 
 class ParserSuite(DataSuite):
@@ -80,3 +84,50 @@ def test_parse_error(testcase: DataDrivenTestCase) -> None:
             testcase.output, e.messages,
             'Invalid compiler output ({}, line {})'.format(testcase.file,
                                                            testcase.line))
+
+
+class ParseTypeStringSuite(TestCase):
+    """Check that the fast path for plain names in parse_type_string gives the same
+    result as going through the parser."""
+
+    def parse_with_parser(self, expr_string: str, line: int, column: int) -> ProperType:
+        # Same as parse_type_string, but always uses parse_type_comment.
+        fallback = 'builtins.str'
+        try:
+            _, node = parse_type_comment(expr_string.strip(), line=line, column=column,
+                                         errors=None)
+        except (SyntaxError, ValueError):
+            return RawExpressionType(expr_string, fallback, line, column)
+        if isinstance(node, UnboundType) and node.original_str_expr is None:
+            node.original_str_expr = expr_string
+            node.original_str_fallback = fallback
+            return node
+        elif isinstance(node, UnionType):
+            return node
+        return RawExpressionType(expr_string, fallback, line, column)
+
+    def describe(self, typ: ProperType) -> Tuple[object, ...]:
+        return (type(typ).__name__, str(typ), typ.line, typ.column,
+                getattr(typ, 'original_str_expr', None),
+                getattr(typ, 'original_str_fallback', None))
+
+    def test_same_as_parser(self) -> None:
+        cases = [
+            # Plain names
+            'int', 'List', '_', '_x1', 'match', 'print', '__debug__',
+            # Dotted names
+            'foo.Bar', 'a.b.c', 'typing.List',
+            # Keywords
+            'None', 'True', 'False', 'if', 'x.None', 'None.x', 'async',
+            # Surrounding whitespace
+            ' int ', '\tfoo.Bar\n', ' a .b',
+            # Non-ASCII names
+            'ñame', 'µ', 'a.ñ',
+            # Not names
+            '', '1a', 'List[int]', 'a.', '.a',
+        ]
+        for expr_string in cases:
+            for column in (7, 0, -1):
+                expected = self.parse_with_parser(expr_string, 3, column)
+                actual = parse_type_string(expr_string, 'builtins.str', 3, column)
+                assert self.describe(actual) == self.describe(expected), (expr_string, column)
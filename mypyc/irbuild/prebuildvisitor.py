@@ -1,6 +1,5 @@
 from mypy.types import Instance, get_proper_type
-from typing import DefaultDict, Dict, List, NamedTuple, Set, Optional, Tuple
-from collections import defaultdict
+from typing import Dict, List, Set, Optional, Tuple
 
 from mypy.nodes import (
     Decorator, Expression, FuncDef, FuncItem, LambdaExpr, NameExpr, SymbolNode, Var, MemberExpr,
@@ -50,12 +49,15 @@ class PreBuildVisitor(TraverserVisitor):
         # Map nested function to its parent/encapsulating function.
         self.nested_funcs: Dict[FuncItem, FuncItem] = {}
 
+        # Map nested function to all functions it is (possibly indirectly)
+        # nested within.
+        self.ancestors: Dict[FuncItem, Set[FuncItem]] = {}
+
         # Map function to its non-special decorators.
         self.funcs_to_decorators: Dict[FuncDef, List[Expression]] = {}
 
         # Map of main singledispatch function to list of registered implementations
-        self.singledispatch_impls: DefaultDict[
-            FuncDef, List[Tuple[TypeInfo, FuncDef]]] = defaultdict(list)
+        self.singledispatch_impls: Dict[FuncDef, List[Tuple[TypeInfo, FuncDef]]] = {}
 
     def visit_decorator(self, dec: Decorator) -> None:
         if dec.decorators:
@@ -70,15 +72,7 @@ class PreBuildVisitor(TraverserVisitor):
                 # Property setters are not treated as decorated methods.
                 self.prop_setters.add(dec.func)
             else:
-                removed: List[int] = []
-                for i, d in enumerate(dec.decorators):
-                    impl = get_singledispatch_register_call_info(d, dec.func)
-                    if impl is not None:
-                        self.singledispatch_impls[impl.singledispatch_func].append(
-                            (impl.dispatch_type, dec.func))
-                        removed.append(i)
-                for i in reversed(removed):
-                    del dec.decorators[i]
+                self.handle_register_calls(dec)
                 # if the only decorators are register calls, we shouldn't treat this
                 # as a decorated function because there aren't any decorators to apply
                 if not dec.decorators:
@@ -87,6 +81,24 @@ class PreBuildVisitor(TraverserVisitor):
                 self.funcs_to_decorators[dec.func] = dec.decorators
         super().visit_decorator(dec)
 
+    def handle_register_calls(self, dec: Decorator) -> None:
+        """Record singledispatch register calls and remove them from the decorator list."""
+        kept: List[Expression] = []
+        for d in dec.decorators:
+            impl = get_singledispatch_register_call_info(d, dec.func)
+            if impl is not None:
+                singledispatch_func, dispatch_type = impl
+                impls = self.singledispatch_impls.get(singledispatch_func)
+                if impls is None:
+                    impls = []
+                    self.singledispatch_impls[singledispatch_func] = impls
+                impls.append((dispatch_type, dec.func))
+            else:
+                kept.append(d)
+        if len(kept) != len(dec.decorators):
+            # Update the list in place, since it may be referenced elsewhere.
+            dec.decorators[:] = kept
+
     def visit_func_def(self, fdef: FuncItem) -> None:
         # TODO: What about overloaded functions?
         self.visit_func(fdef)
@@ -102,10 +114,19 @@ class PreBuildVisitor(TraverserVisitor):
         if self.funcs:
             # Add the new func to the set of nested funcs within the
             # func at top of the func stack.
-            self.encapsulating_funcs.setdefault(self.funcs[-1], []).append(func)
+            parent = self.funcs[-1]
+            if parent not in self.encapsulating_funcs:
+                self.encapsulating_funcs[parent] = []
+            self.encapsulating_funcs[parent].append(func)
             # Add the func at top of the func stack as the parent of
             # new func.
-            self.nested_funcs[func] = self.funcs[-1]
+            self.nested_funcs[func] = parent
+            # The ancestors of the new func are its parent and the
+            # ancestors of its parent.
+            ancestors = {parent}
+            if parent in self.ancestors:
+                ancestors |= self.ancestors[parent]
+            self.ancestors[func] = ancestors
 
         self.funcs.append(func)
         super().visit_func(func)
@@ -124,67 +145,78 @@ class PreBuildVisitor(TraverserVisitor):
             # anything regarding free variables.
             return
 
-        if symbol in self.symbols_to_funcs:
-            orig_func = self.symbols_to_funcs[symbol]
-            if self.is_parent(self.funcs[-1], orig_func):
-                # The function in which the symbol was previously seen is
-                # nested within the function currently being visited. Thus
-                # the current function is a better candidate to contain the
-                # declaration.
-                self.symbols_to_funcs[symbol] = self.funcs[-1]
-                # TODO: Remove from the orig_func free_variables set?
-                self.free_variables.setdefault(self.funcs[-1], set()).add(symbol)
-
-            elif self.is_parent(orig_func, self.funcs[-1]):
-                # The SymbolNode instance has already been visited
-                # before in a parent function, thus it's a non-local
-                # symbol.
-                self.add_free_variable(symbol)
-
-        else:
+        func = self.funcs[-1]
+        orig_func = self.symbols_to_funcs.get(symbol)
+        if orig_func is None:
             # This is the first time the SymbolNode is being
             # visited. We map the SymbolNode to the current FuncDef
             # being visited to note where it was first visited.
-            self.symbols_to_funcs[symbol] = self.funcs[-1]
+            self.symbols_to_funcs[symbol] = func
+
+        elif orig_func is func:
+            # The symbol was previously seen in the current function, which
+            # is by far the most common case, including in all modules
+            # without nested functions. There is nothing to update.
+            pass
+
+        elif self.is_parent(func, orig_func):
+            # The function in which the symbol was previously seen is
+            # nested within the function currently being visited. Thus
+            # the current function is a better candidate to contain the
+            # declaration.
+            self.symbols_to_funcs[symbol] = func
+            # TODO: Remove from the orig_func free_variables set?
+            self.add_free_variable(symbol)
+
+        elif self.is_parent(orig_func, func):
+            # The SymbolNode instance has already been visited
+            # before in a parent function, thus it's a non-local
+            # symbol.
+            self.add_free_variable(symbol)
 
     def is_parent(self, fitem: FuncItem, child: FuncItem) -> bool:
         # Check if child is nested within fdef (possibly indirectly
         # within multiple nested functions).
-        if child in self.nested_funcs:
-            parent = self.nested_funcs[child]
-            if parent == fitem:
-                return True
-            return self.is_parent(fitem, parent)
-        return False
+        ancestors = self.ancestors.get(child)
+        return ancestors is not None and fitem in ancestors
 
     def add_free_variable(self, symbol: SymbolNode) -> None:
         # Find the function where the symbol was (likely) first declared,
         # and mark is as a non-local symbol within that function.
         func = self.symbols_to_funcs[symbol]
-        self.free_variables.setdefault(func, set()).add(symbol)
-
-
-class RegisteredImpl(NamedTuple):
-    singledispatch_func: FuncDef
-    dispatch_type: TypeInfo
+        if func not in self.free_variables:
+            self.free_variables[func] = set()
+        self.free_variables[func].add(symbol)
 
 
 def get_singledispatch_register_call_info(decorator: Expression, func: FuncDef
-                                          ) -> Optional[RegisteredImpl]:
+                                          ) -> Optional[Tuple[FuncDef, TypeInfo]]:
+    """Return (main singledispatch function, dispatch type) for a register call decorator.
+
+    Return None if the decorator isn't a singledispatch register call.
+    """
     # @fun.register(complex)
     # def g(arg): ...
-    if (isinstance(decorator, CallExpr) and len(decorator.args) == 1
-            and isinstance(decorator.args[0], RefExpr)):
+    if type(decorator) is CallExpr:
         callee = decorator.callee
-        dispatch_type = decorator.args[0].node
+        if (type(callee) is not MemberExpr or callee.name != 'register'
+                or len(decorator.args) != 1):
+            return None
+        # RefExpr and TypeInfo have subclasses, so these need isinstance checks
+        arg = decorator.args[0]
+        if not isinstance(arg, RefExpr):
+            return None
+        dispatch_type = arg.node
         if not isinstance(dispatch_type, TypeInfo):
             return None
-
-        if isinstance(callee, MemberExpr):
-            return registered_impl_from_possible_register_call(callee, dispatch_type)
+        return registered_impl_from_possible_register_call(callee, dispatch_type)
     # @fun.register
     # def g(arg: int): ...
-    elif isinstance(decorator, MemberExpr):
+    elif type(decorator) is MemberExpr:
+        # Almost no decorators are register calls, so reject other names before
+        # looking at the type of the first argument.
+        if decorator.name != 'register':
+            return None
         # we don't know if this is a register call yet, so we can't be sure that the function
         # actually has arguments
         if not func.arguments:
@@ -198,9 +230,9 @@ def get_singledispatch_register_call_info(decorator: Expression, func: FuncDef
 
 
 def registered_impl_from_possible_register_call(expr: MemberExpr, dispatch_type: TypeInfo
-                                                ) -> Optional[RegisteredImpl]:
-    if expr.name == 'register' and isinstance(expr.expr, NameExpr):
+                                                ) -> Optional[Tuple[FuncDef, TypeInfo]]:
+    if expr.name == 'register' and type(expr.expr) is NameExpr:
         node = expr.expr.node
-        if isinstance(node, Decorator):
-            return RegisteredImpl(node.func, dispatch_type)
+        if type(node) is Decorator:
+            return node.func, dispatch_type
     return None